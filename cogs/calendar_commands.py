@@ -1,6 +1,6 @@
-from datetime import datetime as dt
+import asyncio
 from dataclasses import dataclass
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import discord
 from discord.abc import Snowflake
@@ -9,12 +9,25 @@ from discord.ext import commands, tasks, vbu
 from cogs.utils import Event
 from cogs.utils.types import GuildContext, GuildInteraction
 from cogs.utils.values import (
+    DAY_SUFFIXES,
     MONTH_OPTIONS,
-    get_day_suffix,
+    MONTH_OPTIONS_BY_NUMBER,
     send_schedule_list_message,
 )
 
 
+_CALENDAR_SHOW_PREFIX = "CALENDAR_SHOW_COMMAND"
+_CALENDAR_SHOW_LIMIT = 50
+_MESSAGE_MAX_LENGTH = 2_000
+_NO_MENTIONS = discord.AllowedMentions.none()
+_CALENDAR_MENTIONS = discord.AllowedMentions(everyone=False, roles=False)
+_MONTH_NAME_BY_LOCALE: Dict[Tuple[int, discord.Locale], str] = {
+    (option.value, locale): name
+    for option in MONTH_OPTIONS
+    for locale, name in option.name_localizations.items()
+}
+
+
 @dataclass
 class FakeContext:
     """
@@ -29,11 +42,18 @@ class CalendarCommands(vbu.Cog[vbu.Bot]):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._calendar_url_cache: Dict[int, Optional[str]] = {}
+        self._events_version: Dict[int, int] = {}
+        self._calendar_content_cache: Dict[int, Tuple[Tuple[int, int, int], str]] = {}
+        self._last_calendar_content: Dict[int, str] = {}
+        self.calendar_update_loop.start()
+
+    def cog_unload(self):
+        self.calendar_update_loop.cancel()
 
     @tasks.loop(minutes=10)
     async def calendar_update_loop(self):
-        for g in self.bot.guilds:
-            self.bot.dispatch("calendar_update", g)
+        await self.broadcast_calendar_update()
 
     @calendar_update_loop.before_loop
     async def before_calendar_update_loop(self):
@@ -74,17 +94,6 @@ class CalendarCommands(vbu.Cog[vbu.Bot]):
         # Set up translation table
         tra = vbu.translation(ctx, "main")
 
-        # If they didn't give a month, put out a list of months
-        if month is None:
-            tra = vbu.translation(ctx, "main")
-            # TRANSLATORS: Text appearing in a message above select buttons.
-            text = tra.gettext("Click any month to see the events.")
-            return await send_schedule_list_message(
-                ctx,
-                message_text=text,
-                custom_id_prefix="CALENDAR_SHOW_COMMAND",
-            )
-
         # Work out what our context is
         interaction: discord.Interaction
         if isinstance(ctx, commands.Context):
@@ -92,37 +101,77 @@ class CalendarCommands(vbu.Cog[vbu.Bot]):
         else:
             interaction = ctx
 
-        # Get the events for that month
+        # If they didn't give a month, put out a list of the months that
+        # have events in them
         await interaction.response.defer()
-        events: List[Event] = await Event.fetch_all_for_guild(
-            discord.Object(interaction.guild_id),
-            month=month,
-        )
+        if month is None:
+            months = await Event.fetch_months_for_guild(
+                discord.Object(interaction.guild_id),
+            )
+            if not months:
+                # TRANSLATORS: Text appearing when a guild has no events at all.
+                text = tra.gettext("There are no events in this server.")
+                return await interaction.followup.send(text)
+            # TRANSLATORS: Text appearing in a message above select buttons.
+            text = tra.gettext("Click any month to see the events.")
+            return await send_schedule_list_message(
+                ctx,
+                message_text=text,
+                custom_id_prefix=_CALENDAR_SHOW_PREFIX,
+                months=months,
+                deferred=True,
+            )
+
+        # Get the events for that month - capped, so that the reply doesn't
+        # run to too many messages, along with how many we left off
+        guild = discord.Object(interaction.guild_id)
+        async with vbu.Database() as db:
+            events: List[Event] = await Event.fetch_all_for_guild(
+                guild,
+                month=month,
+                limit=_CALENDAR_SHOW_LIMIT,
+                db=db,
+            )
+            hidden_count: int = 0
+            if len(events) >= _CALENDAR_SHOW_LIMIT:
+                hidden_count = await Event.count_for_guild(guild, month=month, db=db) - len(events)
 
         # See if there are events in that month
-        month_i8n = tra.gettext(MONTH_OPTIONS[month - 1].name)
+        month_i8n = tra.gettext(MONTH_OPTIONS_BY_NUMBER[month].name)
         if not events:
             text = tra.gettext("There are no events in {month} {year}.").format(month=month_i8n)
             return await interaction.followup.send(text)
 
-        # Give them a list
-        event_strings: List[str] = []
-        events.sort(key=lambda e: (e.timestamp.month, e.timestamp.day,))
-        for e in events:
-            if len(e.name) > 50:
-                text = (
-                    f"\u2022 (**{e.timestamp.day}{get_day_suffix(e.timestamp.day)} "
-                    f"{month_i8n}**) {e.name[:50]}..."
-                )
-            else:
-                text = (
-                    f"\u2022 (**{e.timestamp.day}{get_day_suffix(e.timestamp.day)} "
-                    f"{month_i8n}**) {e.name}"
+        # Give them a list (the database already gives them to us sorted)
+        month_text = f" {month_i8n}**) "
+        event_strings: List[str] = [
+            (
+                f"\u2022 (**{e.timestamp.day}{DAY_SUFFIXES[e.timestamp.day]}{month_text}"
+                f"{e.name if len(e.name) <= 50 else e.name[:50] + '...'}"
+            )
+            for e in events
+        ]
+        if hidden_count > 0:
+            # TRANSLATORS: Text appearing after a list of events that has been cut short.
+            text = tra.gettext("... and {count} more.")
+            event_strings.append(text.format(count=hidden_count))
+
+        # Send them, split over as many messages as it takes
+        output: List[str] = []
+        output_length: int = 0
+        for line in event_strings:
+            if output and output_length + len(line) > _MESSAGE_MAX_LENGTH:
+                await interaction.followup.send(
+                    "\n".join(output),
+                    allowed_mentions=_NO_MENTIONS,
                 )
-            event_strings.append(text)
+                output.clear()
+                output_length = 0
+            output.append(line)
+            output_length += len(line) + 1
         await interaction.followup.send(
-            "\n".join(event_strings),
-            allowed_mentions=discord.AllowedMentions.none(),
+            "\n".join(output),
+            allowed_mentions=_NO_MENTIONS,
         )
 
     @vbu.Cog.listener("on_component_interaction")
@@ -135,13 +184,14 @@ class CalendarCommands(vbu.Cog[vbu.Bot]):
         """
 
         # Make sure the button is correct
-        if not interaction.custom_id.startswith("CALENDAR_SHOW_COMMAND"):
+        custom_id = interaction.custom_id
+        if not custom_id.startswith(_CALENDAR_SHOW_PREFIX):
             return
 
         # And run command
         await self.calendar_show(
             interaction,
-            int(interaction.custom_id.split(" ")[-1]),
+            int(custom_id.rpartition(" ")[2]),
         )
 
     @calendar.command(
@@ -183,29 +233,31 @@ class CalendarCommands(vbu.Cog[vbu.Bot]):
         """
 
         # See if they have a channel set up already
-        has_calendar: bool = False
         async with vbu.Database() as db:
             rows = await db.call(
                 """
                 SELECT
-                    *
-                FROM
-                    guild_settings
-                WHERE
-                    guild_id = $1
+                    EXISTS(
+                        SELECT
+                            1
+                        FROM
+                            guild_settings
+                        WHERE
+                            guild_id = $1
+                        AND
+                            calendar_message_url IS NOT NULL
+                    ) AS has_calendar
                 """,
                 ctx.guild.id,
             )
-            if rows and rows[0]['calendar_message_url']:
-                has_calendar = True
-        if has_calendar:
-            ...  # todo ask if they want to replace
+            has_calendar: bool = rows[0]['has_calendar']
+            if has_calendar:
+                ...  # todo ask if they want to replace
 
-        # Send the current calendar
-        calendar_message = await channel.send("...")
+            # Send the current calendar
+            calendar_message = await channel.send("...")
 
-        # Save message
-        async with vbu.Database() as db:
+            # Save message
             await db.call(
                 """
                 INSERT INTO
@@ -226,48 +278,284 @@ class CalendarCommands(vbu.Cog[vbu.Bot]):
                 """,
                 ctx.guild.id, calendar_message.jump_url,
             )
+        self._calendar_url_cache[ctx.guild.id] = calendar_message.jump_url
+        self._last_calendar_content.pop(ctx.guild.id, None)
 
         # And tell them it's done
         # TRANSLATORS: Text appearing after an auto-updating calendar has been generated.
         text = vbu.translation(ctx, "main").gettext("Your guild calendar has been created.")
         await ctx.interaction.followup.send(text)
-        self.bot.dispatch("calendar_update", ctx.guild)
+        self.bot.dispatch("calendar_update", ctx.guild, events_changed=True)
 
     @vbu.Cog.listener()
     async def on_calendar_update(
             self,
-            guild: discord.Guild) -> None:
+            guild: discord.Guild,
+            events_changed: bool = False) -> None:
         """
-        Update a calendar for the guild. Fail silently if the guild has no calendar
-        URL, or delete the URL from the guild if the message fails to update.
+        Update a calendar for the guild.
         """
 
-        # Get data
-        current_month: int = dt.utcnow().month
-        async with vbu.Database() as db:
+        await self.update_calendar(guild, events_changed=events_changed)
 
-            # Get message URL
+    async def broadcast_calendar_update(self) -> None:
+        """
+        Update the calendar for every guild that the bot is in. The calendar
+        URLs are fetched in a single query, and the updates are run
+        concurrently (a few at a time).
+        """
+
+        # Get all of the guilds that have a calendar - the event versions are
+        # taken first so that anything changed while we wait isn't cached
+        # against the newer version
+        events_versions: Dict[int, int] = self._events_version.copy()
+        async with vbu.Database() as db:
             rows = await db.call(
                 """
                 SELECT
-                    calendar_message_url
+                    guild_id,
+                    calendar_message_url,
+                    calendar_rendered_content,
+                    calendar_rendered_year,
+                    calendar_rendered_month
                 FROM
                     guild_settings
                 WHERE
-                    guild_id = $1
+                    calendar_message_url IS NOT NULL
                 """,
-                guild.id,
             )
+        now = discord.utils.utcnow()
+        current_year: int = now.year
+        current_month: int = now.month
+        calendar_urls: Dict[int, str] = {}
+        for r in rows:
+            calendar_urls[r['guild_id']] = r['calendar_message_url']
+            if r['calendar_rendered_content'] is None:
+                continue
+            if (r['calendar_rendered_year'], r['calendar_rendered_month'],) != (current_year, current_month,):
+                continue
+            if self._get_cached_calendar_content(r['guild_id'], current_year, current_month) is None:
+                self._cache_calendar_content(
+                    r['guild_id'],
+                    current_year,
+                    current_month,
+                    r['calendar_rendered_content'],
+                    version=events_versions.get(r['guild_id'], 0),
+                )
+        guilds: List[discord.Guild] = []
+        for g in self.bot.guilds:
+            self._calendar_url_cache[g.id] = calendar_urls.get(g.id)
+            if g.id in calendar_urls:
+                guilds.append(g)
+
+        # Render the calendars for all of the guilds whose calendars are out
+        # of date, and store them all at once
+        stale_guild_ids: List[int] = [
+            g.id
+            for g in guilds
+            if self._get_cached_calendar_content(g.id, current_year, current_month) is None
+        ]
+        if stale_guild_ids:
+            events_versions = self._events_version.copy()
+            events = await Event.fetch_all_for_guilds(stale_guild_ids, month=current_month)
+            stored_guild_ids: List[int] = []
+            rendered_content: List[str] = []
+            for guild_id in stale_guild_ids:
+                calendar_content = Event.format_events(
+                    events.get(guild_id, []),
+                    include_empty_days=True,
+                )
+                version = events_versions.get(guild_id, 0)
+                self._cache_calendar_content(
+                    guild_id,
+                    current_year,
+                    current_month,
+                    calendar_content,
+                    version=version,
+                )
+
+                # Don't store the render if the events changed mid-fetch
+                if self._events_version.get(guild_id, 0) != version:
+                    continue
+                stored_guild_ids.append(guild_id)
+                rendered_content.append(calendar_content)
+            if stored_guild_ids:
+                async with vbu.Database() as db:
+                    await db.call(
+                        """
+                        UPDATE
+                            guild_settings
+                        SET
+                            calendar_rendered_content = rendered.content,
+                            calendar_rendered_year = $3,
+                            calendar_rendered_month = $4
+                        FROM
+                            UNNEST($1::BIGINT[], $2::TEXT[]) AS rendered (guild_id, content)
+                        WHERE
+                            guild_settings.guild_id = rendered.guild_id
+                        """,
+                        stored_guild_ids, rendered_content, current_year, current_month,
+                    )
+
+        # Update them all
+        semaphore = asyncio.Semaphore(10)
+
+        async def update(guild: discord.Guild) -> None:
+            async with semaphore:
+                await self.update_calendar(guild)
+
+        results = await asyncio.gather(
+            *(update(g) for g in guilds),
+            return_exceptions=True,
+        )
+        for guild, result in zip(guilds, results):
+            if isinstance(result, Exception):
+                self.logger.error(
+                    "Failed to update calendar for guild %s",
+                    guild.id,
+                    exc_info=result,
+                )
+
+    def _get_cached_calendar_content(
+            self,
+            guild_id: int,
+            year: int,
+            month: int) -> Optional[str]:
+        """
+        Get the rendered calendar for a guild, if the cached version is
+        still valid.
+        """
+
+        cached_content = self._calendar_content_cache.get(guild_id)
+        content_key = (year, month, self._events_version.get(guild_id, 0),)
+        if cached_content and cached_content[0] == content_key:
+            return cached_content[1]
+        return None
+
+    def _cache_calendar_content(
+            self,
+            guild_id: int,
+            year: int,
+            month: int,
+            content: str,
+            *,
+            version: int) -> None:
+        """
+        Cache the rendered calendar for a guild against the version of its
+        events that was current before the content was fetched.
+        """
+
+        content_key = (year, month, version,)
+        self._calendar_content_cache[guild_id] = (content_key, content,)
+
+    async def update_calendar(
+            self,
+            guild: discord.Guild,
+            *,
+            events_changed: bool = False) -> None:
+        """
+        Update a calendar for the guild. Fail silently if the guild has no calendar
+        URL, or delete the URL from the guild if the message fails to update.
+        The rendered calendar is cached (and stored in the database) until the
+        month changes or until an update is dispatched with ``events_changed``
+        set.
+        """
+
+        # See if we have a rendered calendar that's still valid
+        if events_changed:
+            self._events_version[guild.id] = self._events_version.get(guild.id, 0) + 1
+        events_version: int = self._events_version.get(guild.id, 0)
+        now = discord.utils.utcnow()
+        current_year: int = now.year
+        current_month: int = now.month
+        calendar_content = self._get_cached_calendar_content(guild.id, current_year, current_month)
+
+        # Get data - there's nothing to do if we already know that the guild
+        # has no calendar
+        calendar_message_url = self._calendar_url_cache.get(guild.id)
+        if guild.id in self._calendar_url_cache and calendar_message_url is None:
+            return
+        if guild.id not in self._calendar_url_cache or calendar_content is None:
+            async with vbu.Database() as db:
+
+                # Get message URL and the last calendar that we rendered
+                use_stored_content = calendar_content is None and not events_changed
+                if guild.id not in self._calendar_url_cache or use_stored_content:
+                    rows = await db.call(
+                        """
+                        SELECT
+                            calendar_message_url,
+                            calendar_rendered_content,
+                            calendar_rendered_year,
+                            calendar_rendered_month
+                        FROM
+                            guild_settings
+                        WHERE
+                            guild_id = $1
+                        """,
+                        guild.id,
+                    )
+                    calendar_message_url = rows[0]['calendar_message_url'] if rows else None
+                    self._calendar_url_cache[guild.id] = calendar_message_url
+                    rendered_for = (
+                        (rows[0]['calendar_rendered_year'], rows[0]['calendar_rendered_month'],)
+                        if rows else None
+                    )
+                    if use_stored_content and rendered_for == (current_year, current_month,):
+                        calendar_content = rows[0]['calendar_rendered_content']
+                        if calendar_content is not None:
+                            self._cache_calendar_content(
+                                guild.id,
+                                current_year,
+                                current_month,
+                                calendar_content,
+                                version=events_version,
+                            )
+
+                # Filter nulls
+                if calendar_message_url is None:
+                    return
+
+                # Get the events, and store the calendar so we don't need to
+                # render it again until the events change
+                if calendar_content is None:
+                    events = await Event.fetch_all_for_guild(guild, month=current_month, db=db)
+                    calendar_content = Event.format_events(events, include_empty_days=True)
+                    self._cache_calendar_content(
+                        guild.id,
+                        current_year,
+                        current_month,
+                        calendar_content,
+                        version=events_version,
+                    )
 
-            # Filter nulls
-            if not rows:
-                return
-            calendar_message_url = rows[0]['calendar_message_url']
-            if calendar_message_url is None:
-                return
+                    # Don't store the render if the events changed mid-fetch
+                    if self._events_version.get(guild.id, 0) == events_version:
+                        await db.call(
+                            """
+                            UPDATE
+                                guild_settings
+                            SET
+                                calendar_rendered_content = $2,
+                                calendar_rendered_year = $3,
+                                calendar_rendered_month = $4
+                            WHERE
+                                guild_id = $1
+                            """,
+                            guild.id, calendar_content, current_year, current_month,
+                        )
+        if calendar_message_url is None:
+            return
 
-            # Get the events
-            events = await Event.fetch_all_for_guild(guild, month=current_month, db=db)
+        # Don't bother editing the message if nothing has changed
+        month_name = _MONTH_NAME_BY_LOCALE[(
+            current_month,
+            discord.Locale(guild.preferred_locale or "en-US"),
+        )]
+        calendar_prefix = f"__**{month_name}**__"
+        content = "\n".join((calendar_prefix, "", calendar_content,))
+        if self._last_calendar_content.get(guild.id) == content:
+            return
 
         # Get message
         ctx = FakeContext(bot=self.bot, guild=guild)
@@ -287,17 +575,15 @@ class CalendarCommands(vbu.Cog[vbu.Bot]):
             return
 
         # Try and edit the message
-        calendar_content = Event.format_events(events, include_empty_days=True)
-        month_name = MONTH_OPTIONS[current_month - 1].name_localizations[
-            discord.Locale(guild.preferred_locale or "en-US")
-        ]
-        calendar_prefix = f"__**{month_name}**__"
         try:
             await message.edit(
-                content=f"{calendar_prefix}\n\n{calendar_content}",
-                allowed_mentions=discord.AllowedMentions(everyone=False, roles=False),
+                content=content,
+                allowed_mentions=_CALENDAR_MENTIONS,
             )
+            self._last_calendar_content[guild.id] = content
         except discord.HTTPException:
+            self._calendar_url_cache[guild.id] = None
+            self._last_calendar_content.pop(guild.id, None)
             async with vbu.Database() as db:
                 await db.call(
                     """
@@ -1,18 +1,69 @@
 import asyncio
-from uuid import uuid4
+import calendar
+import secrets
 from datetime import datetime as dt
+from typing import Dict
+from zoneinfo import ZoneInfo
 
 import discord
 from discord.ext import commands, vbu
-import pytz
 
 from cogs.utils import Event
 from cogs.utils.types import GuildContext, GuildInteraction
 from cogs.utils.values import MONTH_OPTIONS
 
 
+_NO_MENTIONS = discord.AllowedMentions.none()
+
+
 class EventManagementCommands(vbu.Cog[vbu.Bot]):
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending_confirmations: Dict[str, asyncio.Future[discord.Interaction]] = {}
+        self._pending_calendar_updates: Dict[int, asyncio.TimerHandle] = {}
+
+    async def clear_rendered_calendar(
+            self,
+            guild: discord.Guild,
+            *,
+            db: vbu.Database) -> None:
+        """
+        Remove the stored render of the guild's calendar, so that it can't
+        be shown again after the guild's events have changed.
+        """
+
+        await db.call(
+            """
+            UPDATE
+                guild_settings
+            SET
+                calendar_rendered_content = NULL
+            WHERE
+                guild_id = $1
+            """,
+            guild.id,
+        )
+
+    def schedule_calendar_update(self, guild: discord.Guild) -> None:
+        """
+        Dispatch a calendar update for the guild after a short delay, so that
+        a burst of event changes only causes a single update.
+        """
+
+        handle = self._pending_calendar_updates.pop(guild.id, None)
+        if handle is not None:
+            handle.cancel()
+        self._pending_calendar_updates[guild.id] = self.bot.loop.call_later(
+            1.0,
+            self._dispatch_calendar_update,
+            guild,
+        )
+
+    def _dispatch_calendar_update(self, guild: discord.Guild) -> None:
+        self._pending_calendar_updates.pop(guild.id, None)
+        self.bot.dispatch("calendar_update", guild, events_changed=True)
+
     @commands.group(
         application_command_meta=commands.ApplicationCommandMeta(
             permissions=discord.Permissions(manage_guild=True),
@@ -61,21 +112,17 @@ class EventManagementCommands(vbu.Cog[vbu.Bot]):
         # Set up translation table
         tra = vbu.translation(ctx, "main")
 
-        # Create an event object
-        try:
-            timestamp = dt(
-                dt.utcnow().year,
-                month,
-                day,
-                tzinfo=pytz.timezone(timezone),
-            )
-        except ValueError:
+        # Create an event object - if the day has already started this
+        # year then the event is for next year
+        tz = ZoneInfo(timezone)
+        now = discord.utils.utcnow().astimezone(tz)
+        year = now.year + (1 if (month, day) <= (now.month, now.day) else 0)
+        if day > calendar.monthrange(year, month)[1]:
             return await ctx.interaction.response.send_message(
                 tra.gettext("Day is out of range for this month."),
                 ephemeral=True,
             )
-        if timestamp < discord.utils.utcnow():
-            timestamp = timestamp.replace(year=timestamp.year + 1)
+        timestamp = dt(year, month, day, tzinfo=tz)
         event = Event(
             guild_id=ctx.interaction.guild_id,
             user_id=ctx.interaction.user.id,
@@ -83,25 +130,25 @@ class EventManagementCommands(vbu.Cog[vbu.Bot]):
             timestamp=timestamp,
         )
 
-        # Defer so we can check if the event exists
+        # Save the event, so long as there isn't one with that name already
         await ctx.interaction.response.defer()
-        current_event = await Event.fetch_by_name(ctx.guild, name)
-        if current_event:
+        async with vbu.Database() as db:
+            saved = await event.save(new_only=True, db=db)
+            if saved:
+                await self.clear_rendered_calendar(ctx.guild, db=db)
+        if not saved:
             # TRANSLATORS: An error message when trying to make a duplicate event.
             text = tra.gettext("There's already an event with the name **{name}**.")
             return await ctx.interaction.followup.send(
-                text.format(name),
-                allowed_mentions=discord.AllowedMentions.none(),
+                text.format(name=name),
+                allowed_mentions=_NO_MENTIONS,
             )
 
-        # Save the event
-        await event.save()
-
-        # And tell them it's done :)
+        # Update the calendar, and tell them it's done :)
+        self.schedule_calendar_update(ctx.guild)
         # TRANSLATORS: A message appearing after an event is created.
         text = tra.gettext("Event saved!")
         await ctx.interaction.followup.send(text)
-        self.bot.dispatch("calendar_update", ctx.guild)
 
     @event.command(
         name="delete",
@@ -130,7 +177,7 @@ class EventManagementCommands(vbu.Cog[vbu.Bot]):
         event: Event = await Event.convert(ctx, name)
 
         # Threaten to delete the event
-        component_id = str(uuid4())
+        component_id = secrets.token_hex(8)
         components = discord.ui.MessageComponents.boolean_buttons(
             yes=("Yes", f"{component_id} YES"),
             no=("No", f"{component_id} NO"),
@@ -140,17 +187,15 @@ class EventManagementCommands(vbu.Cog[vbu.Bot]):
         text = tra.gettext("Are you sure you want to delete the event **{name}**.")
         await ctx.interaction.followup.send(
             text.format(name=event.name),
-            allowed_mentions=discord.AllowedMentions.none(),
+            allowed_mentions=_NO_MENTIONS,
             components=components,
         )
 
         # Wait for them to agree
+        future: asyncio.Future[discord.Interaction] = self.bot.loop.create_future()
+        self._pending_confirmations[component_id] = future
         try:
-            interaction: discord.Interaction = await self.bot.wait_for(
-                "component_interaction",
-                check=lambda i: i.custom_id.startswith(component_id),
-                timeout=60,
-            )
+            interaction: discord.Interaction = await asyncio.wait_for(future, timeout=60)
         except asyncio.TimeoutError:
             try:
                 # TRANSLATORS: An error message for when a button is not pressed
@@ -163,6 +208,8 @@ class EventManagementCommands(vbu.Cog[vbu.Bot]):
             except:
                 pass
             return
+        finally:
+            self._pending_confirmations.pop(component_id, None)
 
         # See if they said no
         if interaction.custom_id.endswith("NO"):
@@ -176,7 +223,10 @@ class EventManagementCommands(vbu.Cog[vbu.Bot]):
 
         # They agreed
         await interaction.response.defer_update()
-        await event.delete()
+        async with vbu.Database() as db:
+            await event.delete(db=db)
+            await self.clear_rendered_calendar(ctx.guild, db=db)
+        self.schedule_calendar_update(ctx.guild)
         # TRANSLATORS: A message appearing when a user decides
         # to delete an event.
         text = tra.gettext("Event deleted!")
@@ -184,7 +234,23 @@ class EventManagementCommands(vbu.Cog[vbu.Bot]):
             content=text,
             components=None,
         )
-        self.bot.dispatch("calendar_update", ctx.guild)
+
+    @vbu.Cog.listener("on_component_interaction")
+    async def confirmation_button_listener(
+            self,
+            interaction: discord.Interaction):
+        """
+        Waits for confirmation buttons being pressed, and passes the
+        interaction to the command that's waiting for it.
+        """
+
+        future = self._pending_confirmations.pop(
+            interaction.custom_id.partition(" ")[0],
+            None,
+        )
+        if future is None or future.done():
+            return
+        future.set_result(interaction)
 
     @event_delete.autocomplete
     async def event_name_autocomplete(
@@ -195,21 +261,25 @@ class EventManagementCommands(vbu.Cog[vbu.Bot]):
         The autocomplete for guild names.
         """
 
-        # Get the name option
-        options = interaction.options
-        while options and options[0].type == discord.ApplicationCommandOptionType.subcommand:
-            options = options[0].options
+        # Get the name option - this is only used for "/event delete <name>",
+        # so we know it's always the first option of the subcommand
+        options = interaction.options[0].options if interaction.options else None
+
+        # Don't bother searching if they haven't typed anything
+        if not options or not options[0].value:
+            return await interaction.response.send_autocomplete([])
 
-        # Get all of the events
+        # Get the events, as many as Discord will show
         events = await Event.fetch_all_for_guild(
             ctx.guild,
-            name=option[0].value,
+            name=options[0].value,
+            limit=25,
         )
 
         # Send autocomplete
         await interaction.response.send_autocomplete([
             discord.ApplicationCommandOptionChoice(name=e.name, value=e.id)
-            for e in events
+            for e in events[:25]
         ])
 
 
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-from typing import List, Optional, Union, TypedDict
+import calendar
+import operator
+import re
+from typing import Dict, List, Optional, Set, Union, TypedDict
 from uuid import uuid4, UUID
-from datetime import datetime as dt, timedelta
+from datetime import datetime as dt, timezone
 
 import discord
 from discord.abc import Snowflake
 from discord.ext import commands, vbu
-import pytz
 
 from .repeat_time import RepeatTime
-from .values import DAY_OPTIONS, MONTH_OPTIONS, get_day_suffix
+from .values import DAY_OPTIONS, DAY_SUFFIXES, MONTH_OPTIONS_BY_NUMBER
 
 
 __all__ = (
@@ -18,6 +20,11 @@ __all__ = (
 )
 
 
+_UUID_REGEX = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}",
+)
+
+
 class EventGroup(TypedDict):
     day: int
     events: List[Event]
@@ -47,6 +54,7 @@ class Event:
 
     __slots__ = (
         '_id',
+        '_id_str',
         'guild_id',
         'user_id',
         'name',
@@ -88,6 +96,7 @@ class Event:
             If the given event ID is not a UUID.
         """
 
+        self._id_str: Optional[str] = None
         if id is None:
             self._id = None
         else:
@@ -108,29 +117,30 @@ class Event:
             self.repeat = RepeatTime[repeat]
 
     def __repr__(self) -> str:
-        values = []
-        for i in (
-                "id",
-                "guild_id",
-                "user_id",
-                "name",
-                "timestamp",
-                "repeat"):
-            values.append("{0}={1!r}".format(i, getattr(self, i)))
-        return f"{self.__class__.__name__}({', '.join(values)})"
+        return (
+            f"{self.__class__.__name__}("
+            f"id={str(self._id) if self._id else None!r}, "
+            f"guild_id={self.guild_id!r}, "
+            f"user_id={self.user_id!r}, "
+            f"name={self.name!r}, "
+            f"timestamp={self.timestamp!r}, "
+            f"repeat={self.repeat!r})"
+        )
 
     @property
     def id(self) -> str:
-        if self._id:
-            return str(self._id)
-        self._id = uuid4()
-        return str(self._id)
+        if self._id_str is not None:
+            return self._id_str
+        if self._id is None:
+            self._id = uuid4()
+        self._id_str = str(self._id)
+        return self._id_str
 
     @property
     def timestamp(self) -> dt:
         if self._timestamp.tzinfo:
             return self._timestamp
-        self._timestamp = self._timestamp.replace(tzinfo=pytz.utc)
+        self._timestamp = self._timestamp.replace(tzinfo=timezone.utc)
         return self._timestamp
 
     @classmethod
@@ -167,7 +177,12 @@ class Event:
         rows = await _db.call(
             """
             SELECT
-                *
+                id,
+                guild_id,
+                user_id,
+                name,
+                timestamp,
+                repeat
             FROM
                 guild_events
             WHERE
@@ -222,7 +237,12 @@ class Event:
         rows = await _db.call(
             """
             SELECT
-                *
+                id,
+                guild_id,
+                user_id,
+                name,
+                timestamp,
+                repeat
             FROM
                 guild_events
             WHERE
@@ -250,6 +270,7 @@ class Event:
             name: Optional[str] = None,
             month: Optional[int] = None,
             year: Optional[int] = None,
+            limit: Optional[int] = None,
             db: Optional[vbu.Database] = None) -> List[Event]:
         """
         Get an event from the database given a guild ID and a name.
@@ -265,6 +286,8 @@ class Event:
             A month to match by.
         year : Optional[Optional[int]]
             A year to match by.
+        limit : Optional[Optional[int]]
+            The maximum number of events to return.
         db : Optional[Optional[vbu.Database]]
             A database instance. Will open a new instance
             if none is given.
@@ -282,75 +305,62 @@ class Event:
         else:
             _db = db
 
-        # Get the event
-        if name:
+        # Get the events - any name or year filter that isn't given is passed
+        # as null and skipped. The month gets its own statement, so that the
+        # month lookup is always able to use the guild/month/day index
+        if month:
             rows = await _db.call(
                 """
                 SELECT
-                    *
+                    id,
+                    guild_id,
+                    user_id,
+                    name,
+                    timestamp,
+                    repeat
                 FROM
                     guild_events
                 WHERE
                     guild_id = $1
                 AND
-                    LOWER(name) LIKE '%' || LOWER($2) || '%'
+                    EXTRACT(MONTH FROM guild_events.timestamp) = $3
+                AND
+                    ($2::TEXT IS NULL OR LOWER(name) LIKE '%' || LOWER($2) || '%')
+                AND
+                    ($4::INTEGER IS NULL OR EXTRACT(YEAR FROM guild_events.timestamp) = $4)
                 ORDER BY
                     EXTRACT(MONTH FROM guild_events.timestamp) ASC,
                     EXTRACT(DAY FROM guild_events.timestamp) ASC
+                LIMIT
+                    $5
                 """,
-                guild.id, name,
+                guild.id, name or None, month, year or None, limit,
             )
-        elif month:
-            if year:
-                rows = await _db.call(
-                    """
-                    SELECT
-                        *
-                    FROM
-                        guild_events
-                    WHERE
-                        guild_id = $1
-                    AND
-                        EXTRACT(MONTH FROM guild_events.timestamp) = $2
-                    AND
-                        EXTRACT(YEAR FROM guild_events.timestamp) = $3
-                    ORDER BY
-                        EXTRACT(MONTH FROM guild_events.timestamp) ASC,
-                        EXTRACT(DAY FROM guild_events.timestamp) ASC
-                    """,
-                    guild.id, month, year
-                )
-            else:
-                rows = await _db.call(
-                    """
-                    SELECT
-                        *
-                    FROM
-                        guild_events
-                    WHERE
-                        guild_id = $1
-                    AND
-                        EXTRACT(MONTH FROM guild_events.timestamp) = $2
-                    ORDER BY
-                        EXTRACT(MONTH FROM guild_events.timestamp) ASC,
-                        EXTRACT(DAY FROM guild_events.timestamp) ASC
-                    """,
-                    guild.id, month
-                )
         else:
             rows = await _db.call(
                 """
                 SELECT
-                    *
+                    id,
+                    guild_id,
+                    user_id,
+                    name,
+                    timestamp,
+                    repeat
                 FROM
                     guild_events
                 WHERE
                     guild_id = $1
+                AND
+                    ($2::TEXT IS NULL OR LOWER(name) LIKE '%' || LOWER($2) || '%')
+                AND
+                    ($3::INTEGER IS NULL OR EXTRACT(YEAR FROM guild_events.timestamp) = $3)
                 ORDER BY
                     EXTRACT(MONTH FROM guild_events.timestamp) ASC,
                     EXTRACT(DAY FROM guild_events.timestamp) ASC
+                LIMIT
+                    $4
                 """,
-                guild.id,
+                guild.id, name or None, year or None, limit,
             )
 
         # Close the db if we need to
@@ -360,15 +370,188 @@ class Event:
         # And return what we need to
         return [cls(**r) for r in rows]
 
+    @classmethod
+    async def fetch_all_for_guilds(
+            cls,
+            guild_ids: List[int],
+            *,
+            month: int,
+            db: Optional[vbu.Database] = None) -> Dict[int, List[Event]]:
+        """
+        Get all of the events for a given month for multiple guilds
+        in a single query.
+
+        Parameters
+        ----------
+        guild_ids : List[int]
+            The IDs of the guilds that you want to get the events from.
+        month : int
+            The month to match by.
+        db : Optional[Optional[vbu.Database]]
+            A database instance. Will open a new instance
+            if none is given.
+
+        Returns
+        -------
+        Dict[int, List[Event]]
+            A dict of guild ID to that guild's events. Every given
+            guild ID will be present.
+        """
+
+        # Get a database connection to use
+        _db: vbu.Database
+        if db is None:
+            _db = await vbu.Database.get_connection()
+        else:
+            _db = db
+
+        # Get the events
+        rows = await _db.call(
+            """
+            SELECT
+                id,
+                guild_id,
+                user_id,
+                name,
+                timestamp,
+                repeat
+            FROM
+                guild_events
+            WHERE
+                guild_id = ANY($1::BIGINT[])
+            AND
+                EXTRACT(MONTH FROM guild_events.timestamp) = $2
+            ORDER BY
+                EXTRACT(MONTH FROM guild_events.timestamp) ASC,
+                EXTRACT(DAY FROM guild_events.timestamp) ASC
+            """,
+            guild_ids, month,
+        )
+
+        # Close the db if we need to
+        if db is None:
+            await _db.disconnect()
+
+        # And return what we need to
+        events: Dict[int, List[Event]] = {i: [] for i in guild_ids}
+        for r in rows:
+            events[r['guild_id']].append(cls(**r))
+        return events
+
+    @classmethod
+    async def fetch_months_for_guild(
+            cls,
+            guild: Snowflake,
+            *,
+            db: Optional[vbu.Database] = None) -> Set[int]:
+        """
+        Get the months that a guild has events in.
+
+        Parameters
+        ----------
+        guild : Snowflake
+            The guild that you want to get the months for.
+        db : Optional[Optional[vbu.Database]]
+            A database instance. Will open a new instance
+            if none is given.
+
+        Returns
+        -------
+        Set[int]
+            The months (1-12) that have at least one event in them.
+        """
+
+        # Get a database connection to use
+        _db: vbu.Database
+        if db is None:
+            _db = await vbu.Database.get_connection()
+        else:
+            _db = db
+
+        # Get the months
+        rows = await _db.call(
+            """
+            SELECT DISTINCT
+                EXTRACT(MONTH FROM guild_events.timestamp)::INTEGER AS month
+            FROM
+                guild_events
+            WHERE
+                guild_id = $1
+            """,
+            guild.id,
+        )
+
+        # Close the db if we need to
+        if db is None:
+            await _db.disconnect()
+
+        # And return what we need to
+        return {r['month'] for r in rows}
+
+    @classmethod
+    async def count_for_guild(
+            cls,
+            guild: Snowflake,
+            *,
+            month: int,
+            db: Optional[vbu.Database] = None) -> int:
+        """
+        Get the number of events that a guild has in a given month.
+
+        Parameters
+        ----------
+        guild : Snowflake
+            The guild that you want to count the events for.
+        month : int
+            The month to match by.
+        db : Optional[Optional[vbu.Database]]
+            A database instance. Will open a new instance
+            if none is given.
+
+        Returns
+        -------
+        int
+            The number of events in that month.
+        """
+
+        # Get a database connection to use
+        _db: vbu.Database
+        if db is None:
+            _db = await vbu.Database.get_connection()
+        else:
+            _db = db
+
+        # Count the events
+        rows = await _db.call(
+            """
+            SELECT
+                COUNT(*) AS count
+            FROM
+                guild_events
+            WHERE
+                guild_id = $1
+            AND
+                EXTRACT(MONTH FROM guild_events.timestamp) = $2
+            """,
+            guild.id, month,
+        )
+
+        # Close the db if we need to
+        if db is None:
+            await _db.disconnect()
+
+        # And return what we need to
+        return rows[0]['count']
+
     @classmethod
     async def convert(cls, ctx: commands.Context, value: str) -> Event:
         """
         A Novus convert method.
         """
 
-        try:
+        if _UUID_REGEX.fullmatch(value):
             event = await cls.fetch_by_id(UUID(value))
-        except ValueError:
+        else:
             assert ctx.guild
             event = await cls.fetch_by_name(ctx.guild, value)
         if event is None:
@@ -381,7 +564,8 @@ class Event:
     async def save(
             self,
             *,
-            db: Optional[vbu.Database] = None) -> None:
+            db: Optional[vbu.Database] = None,
+            new_only: bool = False) -> bool:
         """
         Save this event into the database.
 
@@ -390,6 +574,15 @@ class Event:
         db : Optional[Optional[vbu.Database]]
             A database instance. Will open a new instance
             if none is given.
+        new_only : Optional[bool]
+            If set, the event will only be saved if there isn't already
+            an event in the guild with the same name (case insensitive),
+            rather than updating any existing event with the same ID.
+
+        Returns
+        -------
+        bool
+            Whether or not the event was saved.
         """
 
         # Get a database connection to use
@@ -399,46 +592,86 @@ class Event:
         else:
             _db = db
 
-        # Get the event
-        await _db.call(
-            """
-            INSERT INTO
-                guild_events
-                (
-                    id,
-                    guild_id,
-                    user_id,
-                    name,
-                    timestamp,
-                    repeat
-                )
-            VALUES
-                (
-                    $1,  -- id
-                    $2,  -- guild_id
-                    $3,  -- user_id
-                    $4,  -- name
-                    $5,  -- timestamp
-                    $6  -- repeat
-                )
-            ON CONFLICT
-                (id)
-            DO UPDATE
-            SET
-                guild_id = excluded.guild_id,
-                user_id = excluded.user_id,
-                name = excluded.user_id,
-                timestamp = excluded.timestamp,
-                repeat = excluded.repeat
-            """,
-            self.id, self.guild_id, self.user_id,
+        # Save the event - the UUID itself is passed rather than its string
+        # so that the driver doesn't have to parse it again
+        if self._id is None:
+            self._id = uuid4()
+        args = (
+            self._id, self.guild_id, self.user_id,
             self.name, discord.utils.naive_dt(self.timestamp),
             self.repeat.name if self.repeat else None,
         )
+        if new_only:
+            rows = await _db.call(
+                """
+                INSERT INTO
+                    guild_events
+                    (
+                        id,
+                        guild_id,
+                        user_id,
+                        name,
+                        timestamp,
+                        repeat
+                    )
+                VALUES
+                    (
+                        $1,  -- id
+                        $2,  -- guild_id
+                        $3,  -- user_id
+                        $4,  -- name
+                        $5,  -- timestamp
+                        $6  -- repeat
+                    )
+                ON CONFLICT
+                    (guild_id, LOWER(name))
+                DO NOTHING
+                RETURNING
+                    id
+                """,
+                *args,
+            )
+            saved = bool(rows)
+        else:
+            await _db.call(
+                """
+                INSERT INTO
+                    guild_events
+                    (
+                        id,
+                        guild_id,
+                        user_id,
+                        name,
+                        timestamp,
+                        repeat
+                    )
+                VALUES
+                    (
+                        $1,  -- id
+                        $2,  -- guild_id
+                        $3,  -- user_id
+                        $4,  -- name
+                        $5,  -- timestamp
+                        $6  -- repeat
+                    )
+                ON CONFLICT
+                    (id)
+                DO UPDATE
+                SET
+                    guild_id = excluded.guild_id,
+                    user_id = excluded.user_id,
+                    name = excluded.name,
+                    timestamp = excluded.timestamp,
+                    repeat = excluded.repeat
+                """,
+                *args,
+            )
+            saved = True
 
         # Close the db if we need to
         if db is None:
             await _db.disconnect()
+        return saved
 
     async def delete(
             self,
@@ -470,9 +703,10 @@ class Event:
             WHERE
                 id = $1
             """,
-            self.id,
+            self._id,
         )
         self._id = None
+        self._id_str = None
 
         # Close the db if we need to
         if db is None:
@@ -497,22 +731,22 @@ class Event:
         """
 
         # Sort the events
-        events.sort(key=lambda e: (e.timestamp, e.name,))
+        events.sort(key=operator.attrgetter("timestamp", "name"))
 
         # Group events by day
-        grouped_events: List[EventGroup] = []
         try:
-            current_day = dt(dt.utcnow().year, events[0].timestamp.month, 1)
+            starting_day = dt(discord.utils.utcnow().year, events[0].timestamp.month, 1)
         except IndexError:
-            current_day = dt.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        starting_day = current_day
-        while starting_day.month == current_day.month:
-            grouped_events.append({
-                "day": current_day.day,
-                "weekday": current_day.weekday(),
+            starting_day = discord.utils.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        first_weekday, month_length = calendar.monthrange(starting_day.year, starting_day.month)
+        grouped_events: List[EventGroup] = [
+            {
+                "day": day,
+                "weekday": (first_weekday + day - 1) % 7,
                 "events": list(),
-            })
-            current_day += timedelta(days=1)
+            }
+            for day in range(1, month_length + 1)
+        ]
 
         # Add each of the events into the event list
         for e in events:
@@ -521,6 +755,7 @@ class Event:
         # Make into a string
         output_lines: List[str] = []
         ENDL = '\n'
+        month_name = MONTH_OPTIONS_BY_NUMBER[starting_day.month].name
         for group in grouped_events:
 
             # See if we want to include this day
@@ -531,12 +766,11 @@ class Event:
                 (
                     # f"{ENDL if group['weekday'] == 0 else ''}**{DAY_OPTIONS[group['weekday']].name} "
                     f"{ENDL if group['weekday'] == 0 else ''}**"
-                    f"{group['day']}{get_day_suffix(group['day'])} "
-                    f"{MONTH_OPTIONS[starting_day.month - 1].name}**"
+                    f"{group['day']}{DAY_SUFFIXES[group['day']]} "
+                    f"{month_name}**"
                 )
             )
-            for event in group['events']:
-                output_lines.append(f"\u2022 {event.name}")
+            output_lines.extend(f"\u2022 {event.name}" for event in group['events'])
 
         # And return
         return "\n".join(output_lines)
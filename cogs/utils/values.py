@@ -1,18 +1,22 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Tuple, Union
+from typing import TYPE_CHECKING, Container, Dict, Optional, Tuple, Union
 
 import discord
 from discord.ext import commands, vbu
 
 if TYPE_CHECKING:
+    import gettext
+
     from .types import GuildContext
 
 
 __all__ = (
     'MONTH_OPTIONS',
+    'MONTH_OPTIONS_BY_NUMBER',
     'TIMEZONE_OPTIONS',
     'DAY_OPTIONS',
+    'DAY_SUFFIXES',
     'get_day_suffix',
     'get_timezone_command_option',
     'send_schedule_list_message',
@@ -21,112 +25,130 @@ __all__ = (
 )
 
 
+_TRANSLATIONS: Dict[discord.Locale, gettext.NullTranslations] = {
+    i: vbu.translation(i, "main")
+    for i in discord.Locale
+}
+
+
 MONTH_OPTIONS: Tuple[discord.ApplicationCommandOptionChoice, ...] = (
     discord.ApplicationCommandOptionChoice(
         name="January",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("January")
-            for i in discord.Locale
+            i: t.gettext("January")
+            for i, t in _TRANSLATIONS.items()
         },
         value=1
     ),
     discord.ApplicationCommandOptionChoice(
         name="February",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("February")
-            for i in discord.Locale
+            i: t.gettext("February")
+            for i, t in _TRANSLATIONS.items()
         },
         value=2
     ),
     discord.ApplicationCommandOptionChoice(
         name="March",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("March")
-            for i in discord.Locale
+            i: t.gettext("March")
+            for i, t in _TRANSLATIONS.items()
         },
         value=3
     ),
     discord.ApplicationCommandOptionChoice(
         name="April",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("April")
-            for i in discord.Locale
+            i: t.gettext("April")
+            for i, t in _TRANSLATIONS.items()
         },
         value=4
     ),
     discord.ApplicationCommandOptionChoice(
         name="May",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("May")
-            for i in discord.Locale
+            i: t.gettext("May")
+            for i, t in _TRANSLATIONS.items()
         },
         value=5
     ),
     discord.ApplicationCommandOptionChoice(
         name="June",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("June")
-            for i in discord.Locale
+            i: t.gettext("June")
+            for i, t in _TRANSLATIONS.items()
         },
         value=6
     ),
     discord.ApplicationCommandOptionChoice(
         name="July",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("July")
-            for i in discord.Locale
+            i: t.gettext("July")
+            for i, t in _TRANSLATIONS.items()
         },
         value=7
     ),
     discord.ApplicationCommandOptionChoice(
         name="August",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("August")
-            for i in discord.Locale
+            i: t.gettext("August")
+            for i, t in _TRANSLATIONS.items()
         },
         value=8
     ),
     discord.ApplicationCommandOptionChoice(
         name="September",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("September")
-            for i in discord.Locale
+            i: t.gettext("September")
+            for i, t in _TRANSLATIONS.items()
         },
         value=9
     ),
     discord.ApplicationCommandOptionChoice(
         name="October",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("October")
-            for i in discord.Locale
+            i: t.gettext("October")
+            for i, t in _TRANSLATIONS.items()
         },
         value=10,
     ),
     discord.ApplicationCommandOptionChoice(
         name="November",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("November")
-            for i in discord.Locale
+            i: t.gettext("November")
+            for i, t in _TRANSLATIONS.items()
         },
         value=11,
     ),
     discord.ApplicationCommandOptionChoice(
         name="December",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("December")
-            for i in discord.Locale
+            i: t.gettext("December")
+            for i, t in _TRANSLATIONS.items()
         },
         value=12,
     ),
 )
 
+
+MONTH_OPTIONS_BY_NUMBER: Dict[int, discord.ApplicationCommandOptionChoice] = {
+    i.value: i
+    for i in MONTH_OPTIONS
+}
+
+
 async def send_schedule_list_message(
         ctx: Union[GuildContext, discord.Interaction],
         *,
         message_text: str,
-        custom_id_prefix: str):
+        custom_id_prefix: str,
+        months: Optional[Container[int]] = None,
+        deferred: bool = False):
     """
     Send a list of buttons that the user can click to look at the schedule.
+    If a container of months is given, only those months will be shown.
+    If the interaction has already been deferred, the buttons are sent as
+    a followup.
     """
 
     # Set up a translation table
@@ -140,7 +162,8 @@ async def send_schedule_list_message(
         interaction = ctx
 
     # Send buttons
-    return await interaction.response.send_message(
+    send = interaction.followup.send if deferred else interaction.response.send_message
+    return await send(
         message_text,
         components=discord.ui.MessageComponents.add_buttons_with_rows(
             *[
@@ -149,6 +172,7 @@ async def send_schedule_list_message(
                     custom_id=f"{custom_id_prefix} {i.value}",
                 )
                 for i in MONTH_OPTIONS
+                if months is None or i.value in months
             ]
         )
     )
@@ -158,73 +182,81 @@ DAY_OPTIONS: Tuple[discord.ApplicationCommandOptionChoice, ...] = (
     discord.ApplicationCommandOptionChoice(
         name="Monday",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("Monday")
-            for i in discord.Locale
+            i: t.gettext("Monday")
+            for i, t in _TRANSLATIONS.items()
         },
         value=0
     ),
     discord.ApplicationCommandOptionChoice(
         name="Tuesday",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("Tuesday")
-            for i in discord.Locale
+            i: t.gettext("Tuesday")
+            for i, t in _TRANSLATIONS.items()
         },
         value=1
     ),
     discord.ApplicationCommandOptionChoice(
         name="Wednesday",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("Wednesday")
-            for i in discord.Locale
+            i: t.gettext("Wednesday")
+            for i, t in _TRANSLATIONS.items()
         },
         value=2
     ),
     discord.ApplicationCommandOptionChoice(
         name="Thursday",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("Thursday")
-            for i in discord.Locale
+            i: t.gettext("Thursday")
+            for i, t in _TRANSLATIONS.items()
         },
         value=3
     ),
     discord.ApplicationCommandOptionChoice(
         name="Friday",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("Friday")
-            for i in discord.Locale
+            i: t.gettext("Friday")
+            for i, t in _TRANSLATIONS.items()
         },
         value=4
     ),
     discord.ApplicationCommandOptionChoice(
         name="Saturday",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("Saturday")
-            for i in discord.Locale
+            i: t.gettext("Saturday")
+            for i, t in _TRANSLATIONS.items()
         },
         value=5
     ),
     discord.ApplicationCommandOptionChoice(
         name="Sunday",
         name_localizations={
-            i: vbu.translation(i, "main").gettext("Sunday")
-            for i in discord.Locale
+            i: t.gettext("Sunday")
+            for i, t in _TRANSLATIONS.items()
         },
         value=6
     ),
 )
 
 
+_SUFFIXES_BY_LAST_DIGIT: Tuple[str, ...] = (
+    "th", "st", "nd", "rd", "th", "th", "th", "th", "th", "th",
+)
+
+
 def get_day_suffix(date: int) -> str:
     """
     Takes a day input and gives the "th", "st", etc output.
     """
 
-    return (
-        "st" if str(date)[-1] == "1" else
-        "nd" if str(date)[-1] == "2" else
-        "rd" if str(date)[-1] == "3" else
-        "th"
-    )
+    if 11 <= date % 100 <= 13:
+        return "th"
+    return _SUFFIXES_BY_LAST_DIGIT[date % 10]
+
+
+DAY_SUFFIXES: Tuple[str, ...] = ("",) + tuple(
+    get_day_suffix(i)
+    for i in range(1, 32)
+)
 
 
 TIMEZONE_OPTIONS: Tuple[discord.ApplicationCommandOptionChoice, ...] = (
@@ -253,8 +285,8 @@ REPEAT_OPTIONS: Tuple[discord.ApplicationCommandOptionChoice, ...] = (
         name="Daily",
         name_localizations={
             # TRANSLATORS: When describing how often an event occurs.
-            i: vbu.translation(i, "main").gettext("Daily")
-            for i in discord.Locale
+            i: t.gettext("Daily")
+            for i, t in _TRANSLATIONS.items()
         },
         value="daily",
     ),
@@ -262,8 +294,8 @@ REPEAT_OPTIONS: Tuple[discord.ApplicationCommandOptionChoice, ...] = (
         name="Monthly",
         name_localizations={
             # TRANSLATORS: When describing how often an event occurs.
-            i: vbu.translation(i, "main").gettext("Monthly")
-            for i in discord.Locale
+            i: t.gettext("Monthly")
+            for i, t in _TRANSLATIONS.items()
         },
         value="monthly",
     ),
@@ -271,8 +303,8 @@ REPEAT_OPTIONS: Tuple[discord.ApplicationCommandOptionChoice, ...] = (
         name="Yearly",
         name_localizations={
             # TRANSLATORS: When describing how often an event occurs.
-            i: vbu.translation(i, "main").gettext("Yearly")
-            for i in discord.Locale
+            i: t.gettext("Yearly")
+            for i, t in _TRANSLATIONS.items()
         },
         value="yearly",
     ),
@@ -284,13 +316,12 @@ REPEAT_OPTIONS_WITH_NONE: Tuple[discord.ApplicationCommandOptionChoice, ...] = (
         name="None",
         name_localizations={
             # TRANSLATORS: When describing how often an event occurs.
-            i: vbu.translation(i, "main").gettext("None")
-            for i in discord.Locale
+            i: t.gettext("None")
+            for i, t in _TRANSLATIONS.items()
         },
         value="none",
     ),
-    *REPEAT_OPTIONS,
-)
+) + REPEAT_OPTIONS
 
 
 MONTH_DAYS: Tuple[int, ...] = (